@@ -1,12 +1,14 @@
 # app/crud.py
 import datetime
-from typing import List, Optional  # <-- ИЗМЕНЕНО: удалены Dict, Any
+import json
+from typing import Any, Dict, List, Optional
 
 from databases.interfaces import \
     Record  # <-- ИЗМЕНЕНО: импортируем Record из interfaces
+from sqlalchemy import DateTime, Text, exists, literal, select
 
 from app.database import database
-from app.models import posts
+from app.models import jobs, post_renders, posts
 from app.schemas import PostCreate, PostUpdate
 
 
@@ -38,6 +40,8 @@ async def update_post(post_id: int, post: PostUpdate) -> bool:
 
     query = posts.update().where(posts.c.id == post_id).values(**update_data)
     result = await database.execute(query)
+    # Старый HTML больше не актуален, до повторного рендеринга бот форматирует сам
+    await delete_post_render(post_id)
     return result > 0
 
 
@@ -45,4 +49,125 @@ async def update_post(post_id: int, post: PostUpdate) -> bool:
 async def delete_post(post_id: int) -> bool:
     query = posts.delete().where(posts.c.id == post_id)
     result = await database.execute(query)
+    await delete_post_render(post_id)
     return result > 0
+
+
+# Delete (Массовое удаление постов)
+async def delete_posts(post_ids: List[int]) -> int:
+    if not post_ids:
+        return 0
+    async with database.transaction():
+        query = posts.delete().where(posts.c.id.in_(post_ids))
+        result = await database.execute(query)
+        await database.execute(
+            post_renders.delete().where(post_renders.c.post_id.in_(post_ids))
+        )
+    return result
+
+
+# --- Предрендеренный HTML постов ---
+
+
+async def get_post_render(post_id: int) -> Optional[Record]:
+    query = post_renders.select().where(post_renders.c.post_id == post_id)
+    return await database.fetch_one(query)
+
+
+async def save_post_render(post_id: int, title: str, text: str, html: str) -> bool:
+    # HTML сохраняется, только если пост не удалили и не изменили, пока он рендерился.
+    # Условие проверяется в каждом запросе, а не один раз заранее.
+    # Сначала идут записи: в SQLite транзакция, начатая с чтения, может получить
+    # "database is locked" при попытке перейти к записи.
+    post_unchanged = exists().where(
+        posts.c.id == post_id, posts.c.title == title, posts.c.text == text
+    )
+    rendered_at = datetime.datetime.now()
+    async with database.transaction():
+        await database.execute(
+            post_renders.delete().where(
+                post_renders.c.post_id == post_id, post_unchanged
+            )
+        )
+        query = post_renders.insert().from_select(
+            ["post_id", "html", "rendered_at"],
+            select(
+                literal(post_id),
+                literal(html, Text),
+                literal(rendered_at, DateTime),
+            ).where(post_unchanged),
+        )
+        await database.execute(query)
+        saved = exists().where(
+            post_renders.c.post_id == post_id,
+            post_renders.c.rendered_at == rendered_at,
+        )
+        return bool(await database.fetch_val(select(saved)))
+
+
+async def delete_post_render(post_id: int) -> None:
+    query = post_renders.delete().where(post_renders.c.post_id == post_id)
+    await database.execute(query)
+
+
+# --- Фоновые задачи ---
+
+
+async def create_job(kind: str, payload: Dict[str, Any]) -> int:
+    query = jobs.insert().values(
+        kind=kind,
+        payload=json.dumps(payload),
+        status="pending",
+        created_at=datetime.datetime.now(),
+    )
+    return await database.execute(query)
+
+
+async def get_job(job_id: int) -> Optional[Record]:
+    query = jobs.select().where(jobs.c.id == job_id)
+    return await database.fetch_one(query)
+
+
+async def get_recent_jobs(limit: int = 50) -> List[Record]:
+    query = jobs.select().order_by(jobs.c.id.desc()).limit(limit)
+    return await database.fetch_all(query)
+
+
+async def get_pending_job_ids() -> List[int]:
+    query = jobs.select().where(jobs.c.status == "pending").order_by(jobs.c.id.asc())
+    return [row["id"] for row in await database.fetch_all(query)]
+
+
+async def requeue_running_jobs() -> None:
+    # Задачи, прерванные остановкой сервера, возвращаем в очередь
+    query = (
+        jobs.update()
+        .where(jobs.c.status == "running")
+        .values(status="pending", started_at=None)
+    )
+    await database.execute(query)
+
+
+async def mark_job_running(job_id: int) -> None:
+    query = (
+        jobs.update()
+        .where(jobs.c.id == job_id)
+        .values(status="running", started_at=datetime.datetime.now())
+    )
+    await database.execute(query)
+
+
+async def mark_job_finished(
+    job_id: int, result: Any = None, error: Optional[str] = None
+) -> None:
+    query = (
+        jobs.update()
+        .where(jobs.c.id == job_id)
+        .values(
+            status="failed" if error is not None else "done",
+            result=json.dumps(result) if error is None else None,
+            error=error,
+            finished_at=datetime.datetime.now(),
+        )
+    )
+    await database.execute(query)
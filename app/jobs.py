@@ -0,0 +1,203 @@
+# app/jobs.py
+import asyncio
+import html
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.crud import (
+    create_job,
+    delete_posts,
+    get_all_posts,
+    get_job,
+    get_pending_job_ids,
+    get_post,
+    mark_job_finished,
+    mark_job_running,
+    requeue_running_jobs,
+    save_post_render,
+)
+
+# Загружаем переменные окружения
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Количество асинхронных воркеров, разбирающих очередь
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Количество процессов для CPU-тяжелых задач (0 - использовать пул потоков)
+JOB_PROCESS_WORKERS = int(os.getenv("JOB_PROCESS_WORKERS", "0"))
+
+
+# --- CPU-тяжелые функции ---
+# Должны быть объявлены на уровне модуля, чтобы их можно было
+# передать в ProcessPoolExecutor.
+
+
+def render_post_html(title: str, text: str, created_at: datetime) -> str:
+    formatted_date = created_at.strftime("%d.%m.%Y %H:%M")
+    return (
+        f"<b>{html.escape(title)}</b>\n\n"
+        f"{html.escape(text)}\n\n"
+        f"<i>Дата создания: {formatted_date}</i>"
+    )
+
+
+def render_posts_html(items: List[Tuple[str, str, datetime]]) -> List[str]:
+    return [render_post_html(*item) for item in items]
+
+
+class JobQueue:
+    """
+    Внутрипроцессная очередь фоновых задач.
+    Задачи хранятся в таблице jobs, поэтому незавершенные задачи
+    подхватываются заново после перезапуска сервера.
+    """
+
+    def __init__(
+        self, workers: int = JOB_WORKERS, process_workers: int = JOB_PROCESS_WORKERS
+    ):
+        self._workers_count = max(1, workers)
+        self._process_workers = process_workers
+        # Очередь создается в start(), т.к. asyncio.Queue привязывается к циклу
+        # событий, а lifespan может запускаться несколько раз в одном процессе
+        self._queue: "Optional[asyncio.Queue[int]]" = None
+        self._tasks: List[asyncio.Task] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def start(self) -> None:
+        if self._process_workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self._process_workers)
+
+        queue: "asyncio.Queue[int]" = asyncio.Queue()
+        await requeue_running_jobs()
+        for job_id in await get_pending_job_ids():
+            queue.put_nowait(job_id)
+        self._queue = queue
+
+        self._tasks = []
+        for _ in range(self._workers_count):
+            task = asyncio.create_task(self._worker(queue))
+            task.add_done_callback(self._on_worker_done)
+            self._tasks.append(task)
+        logger.info(
+            f"Job queue started: {self._workers_count} workers, "
+            f"{queue.qsize()} pending jobs"
+        )
+
+    async def stop(self) -> None:
+        # Невыполненные задачи остаются pending в БД и подхватятся при следующем start()
+        self._queue = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> int:
+        job_id = await create_job(kind, payload)
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+        return job_id
+
+    async def run_cpu(self, func: Callable[..., Any], *args: Any) -> Any:
+        # Без пула процессов используется пул потоков по умолчанию,
+        # чтобы не блокировать цикл событий
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _worker(self, queue: "asyncio.Queue[int]") -> None:
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                # Ошибка вне обработчика (например, БД) - логируем и продолжаем
+                logger.exception(f"Job {job_id} could not be processed")
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    def _on_worker_done(task: asyncio.Task) -> None:
+        # Воркер не должен завершаться сам - иначе очередь молча перестает работать
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Job worker crashed", exc_info=task.exception())
+
+    async def _run(self, job_id: int) -> None:
+        job = await get_job(job_id)
+        if job is None or job["status"] != "pending":
+            return
+
+        await mark_job_running(job_id)
+        try:
+            handler = JOB_HANDLERS.get(job["kind"])
+            if handler is None:
+                raise ValueError(f"Неизвестный тип задачи: {job['kind']}")
+            result = await handler(self, json.loads(job["payload"]))
+        except Exception as e:
+            logger.exception(f"Job {job_id} ({job['kind']}) failed")
+            await mark_job_finished(job_id, error=str(e) or e.__class__.__name__)
+        else:
+            await mark_job_finished(job_id, result=result)
+
+
+# --- Обработчики задач ---
+
+
+async def _render_post(queue: JobQueue, payload: Dict[str, Any]) -> Dict[str, Any]:
+    if "post_id" not in payload:
+        raise ValueError("В payload отсутствует post_id")
+    post_id = int(payload["post_id"])
+
+    post = await get_post(post_id)
+    if not post:
+        return {"post_id": post_id, "rendered": False}
+
+    post_html = await queue.run_cpu(
+        render_post_html, post["title"], post["text"], post["created_at"]
+    )
+    rendered = await save_post_render(post_id, post["title"], post["text"], post_html)
+    return {"post_id": post_id, "rendered": rendered}
+
+
+async def _render_all_posts(queue: JobQueue, payload: Dict[str, Any]) -> Dict[str, Any]:
+    all_posts = await get_all_posts()
+    rendered = await queue.run_cpu(
+        render_posts_html,
+        [(post["title"], post["text"], post["created_at"]) for post in all_posts],
+    )
+    saved = 0
+    for post, post_html in zip(all_posts, rendered):
+        if await save_post_render(post["id"], post["title"], post["text"], post_html):
+            saved += 1
+    return {"rendered": saved}
+
+
+async def _bulk_delete_posts(
+    queue: JobQueue, payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    if not isinstance(payload.get("post_ids"), list):
+        raise ValueError("В payload отсутствует список post_ids")
+    post_ids = [int(post_id) for post_id in payload["post_ids"]]
+
+    deleted = await delete_posts(post_ids)
+    return {"deleted": deleted}
+
+
+JobHandler = Callable[[JobQueue, Dict[str, Any]], Awaitable[Any]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    "render_post": _render_post,
+    "render_all_posts": _render_all_posts,
+    "bulk_delete_posts": _bulk_delete_posts,
+}
+
+# Общий экземпляр очереди (запускается в lifespan FastAPI)
+job_queue = JobQueue()
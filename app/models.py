@@ -1,7 +1,7 @@
 # app/models.py
 import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Table
+from sqlalchemy import Column, DateTime, Integer, String, Table, Text
 
 from app.database import metadata  # Импортируем metadata из database.py
 
@@ -14,3 +14,27 @@ posts = Table(
     Column("text", String),
     Column("created_at", DateTime, default=datetime.datetime.now),
 )
+
+# Предрендеренный HTML поста для вывода ботом с parse_mode="HTML"
+post_renders = Table(
+    "post_renders",
+    metadata,
+    Column("post_id", Integer, primary_key=True),
+    Column("html", Text),
+    Column("rendered_at", DateTime, default=datetime.datetime.now),
+)
+
+# Фоновые задачи (хранятся в БД, чтобы переживать перезапуск сервера)
+jobs = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("kind", String, index=True),
+    Column("payload", Text),  # JSON
+    Column("status", String, index=True),  # pending / running / done / failed
+    Column("result", Text, nullable=True),  # JSON
+    Column("error", Text, nullable=True),
+    Column("created_at", DateTime, default=datetime.datetime.now),
+    Column("started_at", DateTime, nullable=True),
+    Column("finished_at", DateTime, nullable=True),
+)
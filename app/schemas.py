@@ -1,8 +1,8 @@
 # app/schemas.py
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, Json
 
 
 # Базовая схема для поста (общие поля)
@@ -31,3 +31,41 @@ class PostResponse(PostBase):
 
     class Config:
         from_attributes = True  # В старых версиях Pydantic был orm_mode = True
+
+
+# Схема для постановки задачи в очередь
+class JobCreate(BaseModel):
+    # Допустимые типы проверяются по app.jobs.JOB_HANDLERS
+    kind: str = Field(..., description="Тип задачи")
+    payload: Dict[str, Any] = Field(
+        default_factory=dict,
+        description='Параметры задачи, например {"post_id": 1} или {"post_ids": [1, 2]}',
+    )
+
+
+# Схема для ответа API по задаче
+class JobResponse(BaseModel):
+    id: int = Field(..., description="Уникальный идентификатор задачи")
+    kind: str = Field(..., description="Тип задачи")
+    payload: Json[Dict[str, Any]] = Field(..., description="Параметры задачи")
+    status: str = Field(
+        ..., description="Статус задачи: pending / running / done / failed"
+    )
+    result: Optional[Json[Any]] = Field(None, description="Результат задачи")
+    error: Optional[str] = Field(None, description="Текст ошибки, если задача упала")
+    created_at: datetime = Field(..., description="Дата и время постановки в очередь")
+    started_at: Optional[datetime] = Field(None, description="Дата и время запуска")
+    finished_at: Optional[datetime] = Field(None, description="Дата и время завершения")
+
+    class Config:
+        from_attributes = True
+
+
+# Схема для ответа с предрендеренным HTML поста
+class PostRenderResponse(BaseModel):
+    post_id: int = Field(..., description="ID поста")
+    html: str = Field(..., description="HTML для отправки ботом с parse_mode=HTML")
+    rendered_at: datetime = Field(..., description="Дата и время рендеринга")
+
+    class Config:
+        from_attributes = True
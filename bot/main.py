@@ -1,4 +1,5 @@
 # bot/main.py
+import html
 import logging
 import os
 from datetime import datetime
@@ -99,19 +100,27 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(f"{API_BASE_URL}/posts/{post_id}")
-                response.raise_for_status()
-                post = response.json()
-
-            # Форматируем дату
-            created_at_dt = datetime.fromisoformat(post["created_at"])
-            formatted_date = created_at_dt.strftime("%d.%m.%Y %H:%M")
-
-            message_text = (
-                f"<b>{post['title']}</b>\n\n"
-                f"{post['text']}\n\n"
-                f"<i>Дата создания: {formatted_date}</i>"
-            )
+                # Сначала пробуем HTML, подготовленный фоновой задачей на сервере
+                rendered = await client.get(f"{API_BASE_URL}/posts/{post_id}/html")
+                if rendered.status_code == 200:
+                    post = None
+                    message_text = rendered.json()["html"]
+                else:
+                    response = await client.get(f"{API_BASE_URL}/posts/{post_id}")
+                    response.raise_for_status()
+                    post = response.json()
+
+            if post is not None:
+                # Пост еще не отрендерен сервером - форматируем сами так же,
+                # как render_post_html в app/jobs.py
+                created_at_dt = datetime.fromisoformat(post["created_at"])
+                formatted_date = created_at_dt.strftime("%d.%m.%Y %H:%M")
+
+                message_text = (
+                    f"<b>{html.escape(post['title'])}</b>\n\n"
+                    f"{html.escape(post['text'])}\n\n"
+                    f"<i>Дата создания: {formatted_date}</i>"
+                )
             await query.edit_message_text(message_text, parse_mode="HTML")
 
         except httpx.HTTPStatusError as e:
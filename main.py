@@ -8,6 +8,7 @@ from fastapi import (
     Depends,
     FastAPI,
     HTTPException,
+    Query,
     status,
     Request,
 )  # <-- ДОБАВЛЕНО Request
@@ -21,9 +22,26 @@ from app.auth import (
     get_current_active_user,
     User,
 )  # <-- Убедитесь, что User импортирован
-from app.crud import create_post, delete_post, get_all_posts, get_post, update_post
+from app.crud import (
+    create_post,
+    delete_post,
+    get_all_posts,
+    get_job,
+    get_post,
+    get_post_render,
+    get_recent_jobs,
+    update_post,
+)
 from app.database import create_db_tables, database
-from app.schemas import PostCreate, PostResponse, PostUpdate
+from app.jobs import JOB_HANDLERS, job_queue
+from app.schemas import (
+    JobCreate,
+    JobResponse,
+    PostCreate,
+    PostRenderResponse,
+    PostResponse,
+    PostUpdate,
+)
 
 # Для обработки ошибок валидации и общих ошибок
 from fastapi.exceptions import RequestValidationError  # <-- ДОБАВЛЕНО
@@ -46,8 +64,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up...")  # <-- Изменено на logger.info
     create_db_tables()
     await database.connect()
+    await job_queue.start()
     yield
     logger.info("Shutting down...")  # <-- Изменено на logger.info
+    await job_queue.stop()
     await database.disconnect()
 
 
@@ -151,6 +171,7 @@ async def create_new_post(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve created post.",
         )
+    await job_queue.enqueue("render_post", {"post_id": post_id})
     return created_post
 
 
@@ -176,6 +197,25 @@ async def read_post_by_id(post_id: int):
     return post
 
 
+@app.get(
+    "/posts/{post_id}/html",
+    response_model=PostRenderResponse,
+    summary="Получить предрендеренный HTML поста",
+)
+async def read_post_html(post_id: int):
+    """
+    Возвращает HTML поста, подготовленный фоновой задачей render_post.
+    Если пост еще не отрендерен, возвращает 404.
+    - **post_id**: ID поста
+    """
+    post_render = await get_post_render(post_id)
+    if not post_render:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Rendered post not found"
+        )
+    return post_render
+
+
 @app.put(
     "/posts/{post_id}",
     response_model=PostResponse,
@@ -208,6 +248,7 @@ async def update_existing_post(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve updated post after update.",
         )
+    await job_queue.enqueue("render_post", {"post_id": post_id})
     return updated_post
 
 
@@ -231,6 +272,72 @@ async def delete_existing_post(
     return
 
 
+@app.post(
+    "/jobs/",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Поставить фоновую задачу в очередь (требуется аутентификация)",
+)
+async def create_new_job(
+    job: JobCreate, current_user: User = Depends(get_current_active_user)
+):
+    """
+    Ставит задачу в фоновую очередь и сразу возвращает ее статус.
+    - **kind**: render_post (`{"post_id": 1}`), render_all_posts (`{}`)
+      или bulk_delete_posts (`{"post_ids": [1, 2]}`)
+    - **payload**: Параметры задачи
+    """
+    if job.kind not in JOB_HANDLERS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown job kind. Allowed: {', '.join(JOB_HANDLERS)}",
+        )
+    job_id = await job_queue.enqueue(job.kind, job.payload)
+    created_job = await get_job(job_id)
+    if not created_job:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve created job.",
+        )
+    return created_job
+
+
+@app.get(
+    "/jobs/",
+    response_model=List[JobResponse],
+    summary="Получить последние задачи (требуется аутентификация)",
+)
+async def read_recent_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Возвращает последние фоновые задачи, начиная с самых новых.
+    - **limit**: Максимальное количество задач
+    """
+    return await get_recent_jobs(limit)
+
+
+@app.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Получить статус задачи (требуется аутентификация)",
+)
+async def read_job_by_id(
+    job_id: int, current_user: User = Depends(get_current_active_user)
+):
+    """
+    Возвращает статус фоновой задачи по ее идентификатору.
+    - **job_id**: ID задачи
+    """
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return job
+
+
 if __name__ == "__main__":
     import uvicorn
 